@@ -3,6 +3,7 @@ import re
 from github_repository import GitHubRepository
 from rag_system import AdvancedRAGSystem
 from code_generate import CodeGenerate
+from config import config
 
 
 
@@ -47,6 +48,27 @@ def main():
             type="primary",
             help="This may take a few minutes for large repositories"
         )
+        build_digest = st.sidebar.checkbox(
+            "🧭 Build repository digest",
+            value=True,
+            help="Precompute languages, structure, entry points and directory summaries for instant analysis"
+        )
+        progressive = st.sidebar.checkbox(
+            "⚡ Progressive indexing",
+            value=True,
+            help="Index the most important files first and keep indexing the rest in the background"
+        )
+        if progressive:
+            time_budget = st.sidebar.number_input(
+                "⏱️ Time budget (seconds, 0 = no limit)",
+                min_value=0,
+                value=config.INDEX_TIME_BUDGET
+            )
+            file_budget = st.sidebar.number_input(
+                "📄 File budget (0 = no limit)",
+                min_value=0,
+                value=config.INDEX_FILE_BUDGET
+            )
     else:
         st.header("Generate Code")
     
@@ -70,6 +92,10 @@ def main():
             progress_bar = st.progress(0)
             status_text = st.empty()
             
+            # Stop background indexing of the previously processed repository
+            if st.session_state.rag_system:
+                st.session_state.rag_system.stop_indexing()
+            
             try:
                 # Initialize RAG system
                 status_text.text("Initializing RAG system...")
@@ -92,20 +118,53 @@ def main():
                 progress_bar.progress(40)
                 
                 github_client = GitHubRepository()
-                documents = github_client.crawl_repository(repo_owner, repo_name)
                 
-                if not documents:
+                if progressive:
+                    # Rank every file so the most important ones are indexed first
+                    plan = github_client.plan_repository_files(repo_owner, repo_name)
+                    
+                    if not plan:
+                        st.error("No processable files found in repository")
+                        return
+                    
+                    st.info(f"Found {len(plan)} files")
+                    
+                    status_text.text("Indexing the most important files first...")
+                    progress_bar.progress(70)
+                    
+                    success = rag_system.process_repository_progressive(
+                        github_client.iter_file_streams(repo_owner, repo_name, plan),
+                        total_files=len(plan),
+                        build_digest=build_digest,
+                        time_budget=time_budget or None,
+                        file_budget=file_budget or None,
+                        notices=github_client.notices,
+                        planned_files=github_client.describe_files(repo_owner, repo_name, plan)
+                    )
+                else:
+                    # The full tree gives coverage a total that includes files the crawl skips
+                    total_files = len(github_client.get_repo_tree(repo_owner, repo_name))
+                    files = github_client.iter_repository_files(repo_owner, repo_name)
+                    
+                    # Files are fetched, decoded and split as they stream in
+                    status_text.text("Streaming files, processing documents and creating embeddings..."
+                                     + (" Building repository digest..." if build_digest else ""))
+                    progress_bar.progress(70)
+                    
+                    success = rag_system.process_repository_files(
+                        files,
+                        build_digest=build_digest,
+                        total_files=total_files,
+                        notices=github_client.notices
+                    )
+                    
+                    if rag_system.indexed_files:
+                        st.info(f"Found {len(rag_system.indexed_files)} files")
+                
+                if not rag_system.indexed_files:
                     st.error("No processable files found in repository")
                     return
                 
-                st.info(f"Found {len(documents)} files")
-                
-                # Process repository
-                status_text.text("Processing documents and creating embeddings...")
-                progress_bar.progress(70)
-                
-                success = rag_system.process_repository(documents)
-                
                 if not success:
                     st.error("Failed to process repository")
                     return
@@ -120,7 +179,10 @@ def main():
                 st.session_state.chat_history = []
                 
                 st.balloons()
-                st.success(f"🎉 Repository **{current_repo}** processed successfully!")
+                if rag_system.get_coverage()['done']:
+                    st.success(f"🎉 Repository **{current_repo}** processed successfully!")
+                else:
+                    st.success(f"🎉 Repository **{current_repo}** is ready for questions, remaining files are indexing in the background")
                 
             except Exception as e:
                 st.error(f"Error processing repository: {str(e)}")
@@ -131,6 +193,28 @@ def main():
         if st.session_state.repository_processed and st.session_state.rag_system:
             st.header("💬 Chat with Repository")
             
+            # Show how much of the repository is indexed so far
+            coverage = st.session_state.rag_system.get_coverage()
+            if not coverage['done']:
+                st.progress(coverage['percent'] / 100)
+                st.caption(f"⏳ Answers cover {coverage['covered_files']}/{coverage['total_files']} files "
+                           f"({coverage['percent']}%), indexing continues in the background")
+                st.button("🔄 Refresh coverage")
+            elif coverage['covered_files'] < coverage['total_files']:
+                st.caption(f"Answers cover {coverage['covered_files']}/{coverage['total_files']} files "
+                           f"({coverage['percent']}%), {coverage['stopped_reason'] or 'some files were skipped'}")
+            
+            unindexed = coverage['attempted_files'] - coverage['covered_files']
+            if unindexed > 0:
+                st.caption(f"{unindexed} of {coverage['attempted_files']} files read so far had no indexable content")
+            
+            # Warnings collected while indexing, possibly on the background thread
+            messages = st.session_state.rag_system.indexing_status.get('messages', [])
+            if messages:
+                with st.expander(f"⚠️ Indexing notices ({len(messages)})"):
+                    for message in list(messages):
+                        st.warning(message)
+            
             # Query input
             question = st.text_input(
                 "Ask a question about the repository:",
@@ -149,6 +233,10 @@ def main():
                     st.subheader("💡 Answer")
                     st.write(result['answer'])
                     
+                    if 'coverage' in result and result['coverage']['percent'] < 100:
+                        st.caption(f"Based on {result['coverage']['covered_files']}/{result['coverage']['total_files']} "
+                                   f"indexed files ({result['coverage']['percent']}%)")
+                    
                     # Display sources
                     if result['sources']:
                         st.subheader("📚 Sources")
@@ -163,7 +251,10 @@ def main():
                                     st.markdown(f"**File:** `{metadata.get('file_name', 'N/A')}`")
                                     st.markdown(f"**Type:** {metadata.get('file_type', 'N/A')}")
                                 with col2:
-                                    st.markdown(f"**Chunk:** {metadata.get('chunk_id', 0) + 1}/{metadata.get('total_chunks', 1)}")
+                                    if 'total_chunks' in metadata:
+                                        st.markdown(f"**Chunk:** {metadata['chunk_id'] + 1}/{metadata['total_chunks']}")
+                                    else:
+                                        st.markdown(f"**Chunk:** {metadata.get('chunk_id', 0) + 1}")
                                     st.markdown(f"**Size:** {metadata.get('chunk_size', len(source.page_content))} chars")
                                 
                                 # Show content
@@ -188,22 +279,34 @@ def main():
             st.header("📊 Repository Analysis")
             
             if st.button("🔍 Analyze Repository Structure"):
-                with st.spinner("Analyzing repository..."):
-                    analysis_questions = [
-                        "What programming languages are primarily used in this repository?",
-                        "What is the overall project structure and organization?",
-                        "What are the main entry points or important files?"
-                    ]
-                    
-                    analysis_results = []
-                    for q in analysis_questions:
-                        result = st.session_state.rag_system.query(q)
-                        analysis_results.append({"question": q, "answer": result['answer']})
-                    
-                    for analysis in analysis_results:
-                        st.subheader(analysis['question'])
-                        st.write(analysis['answer'])
+                rag_system = st.session_state.rag_system
+                
+                # Answer instantly from the digest built at index time
+                if rag_system.digest:
+                    digest = rag_system.repository_digest
+                    for section, question in digest.sections.items():
+                        st.subheader(question)
+                        st.markdown(digest.format_section(rag_system.digest, section))
                         st.markdown("---")
+                elif rag_system.digest_requested:
+                    st.info("⏳ The repository digest is still being built, try again once more of the repository is indexed")
+                else:
+                    with st.spinner("Analyzing repository..."):
+                        analysis_questions = [
+                            "What programming languages are primarily used in this repository?",
+                            "What is the overall project structure and organization?",
+                            "What are the main entry points or important files?"
+                        ]
+                        
+                        analysis_results = []
+                        for q in analysis_questions:
+                            result = rag_system.query(q)
+                            analysis_results.append({"question": q, "answer": result['answer']})
+                        
+                        for analysis in analysis_results:
+                            st.subheader(analysis['question'])
+                            st.write(analysis['answer'])
+                            st.markdown("---")
     else:
         query = st.chat_input("Enter you problem statement....")
 
@@ -231,7 +334,8 @@ def main():
             2. **AdvancedDocumentProcessor**: Language-aware document chunking
             3. **EmbeddingManager**: FAISS vector store creation and similarity search
             4. **LLMManager**: Groq LLM provider support
-            5. **AdvancedRAGSystem**: Orchestrates the entire RAG pipeline
+            5. **RepositoryDigest**: Precomputed languages, structure, entry points and directory summaries
+            6. **AdvancedRAGSystem**: Orchestrates the entire RAG pipeline
             
             ### Performance Tips:
             - Groq provides fast responses with high quality
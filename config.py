@@ -8,13 +8,34 @@ load_dotenv()
 class Config:
     GROQ_API_KEY: str = st.secrets["GROQ_API_KEY"]  # Replace with your actual Groq API key
     GITHUB_TOKEN: str = st.secrets["GITHUB_TOKEN"]  # Replace with your actual GitHub token
-    MAX_FILE_SIZE: int = 1000000  # 1MB
+    MAX_FILE_BYTES: int = 2000000  # 2MB read per file, larger files are truncated
+    MAX_REPO_BYTES: int = 10000000  # 10MB read per repository, about 12k chunks to embed on CPU
+    STREAM_CHUNK_BYTES: int = 65536  # Bytes read per network chunk
+    STREAM_WINDOW_CHARS: int = 20000  # Text buffered before each incremental split
+    EMBED_BATCH_SIZE: int = 256  # Chunks embedded and added to the vector store at once
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 200
     MAX_TOKENS: int = 2048
     TEMPERATURE: float = 0.3
     TOP_K_RETRIEVAL: int = 5
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    INDEX_BATCH_SIZE: int = 20  # Files committed to the vector store per progressive batch
+    INDEX_TIME_BUDGET: int = 0  # Seconds of progressive indexing, 0 for no limit
+    INDEX_FILE_BUDGET: int = 0  # Files indexed progressively, 0 for no limit
+    SMALL_FILE_BYTES: int = 20000  # Files up to this size rank as small core modules
+    DIGEST_MAX_DIRECTORIES: int = 20  # Directories summarized in the digest
+    DIGEST_MAX_CHARS_PER_DIRECTORY: int = 6000
+    DIGEST_EXCERPT_CHARS: int = 1500  # Leading characters of each file used for summaries
+    DIGEST_MAX_WORKERS: int = 4  # Concurrent directory summary requests
     GROQ_MODEL: str = "openai/gpt-oss-120b"
 
 config = Config()
+
+# File names that usually start or configure a project
+ENTRY_POINT_FILES = {
+    'main.py', '__main__.py', 'app.py', 'manage.py', 'wsgi.py', 'asgi.py',
+    'cli.py', 'setup.py', 'pyproject.toml', 'package.json', 'index.js',
+    'index.ts', 'server.js', 'app.js', 'main.js', 'main.ts', 'main.go',
+    'main.rs', 'lib.rs', 'cargo.toml', 'go.mod', 'main.java',
+    'application.java', 'program.cs', 'index.php', 'dockerfile', 'makefile'
+}
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Dict, Iterable, Iterator, Tuple
 from langchain.text_splitter import RecursiveCharacterTextSplitter, Language
 from langchain.schema import Document
 from config import config
@@ -41,25 +41,49 @@ class AdvancedDocumentProcessor:
             )
         }
     
-    def process_documents(self, documents: List[Document]) -> List[Document]:
-        """Process documents with appropriate splitters"""
-        processed_docs = []
+    def process_stream(self, content_stream: Iterable[str], metadata: Dict) -> Iterator[Document]:
+        """Split a lazily streamed file, keeping only a bounded window of text in memory"""
+        splitter = self.splitters.get(metadata.get('file_type', 'default'), self.splitters['default'])
+        buffer = ""
         
-        for doc in documents:
-            file_type = doc.metadata.get('file_type', 'default')
-            splitter = self.splitters.get(file_type, self.splitters['default'])
+        for text in content_stream:
+            buffer += text
+            if len(buffer) < config.STREAM_WINDOW_CHARS:
+                continue
             
-            # Split the document
-            chunks = splitter.split_documents([doc])
+            chunks = splitter.split_text(buffer)
+            if len(chunks) < 2:
+                continue
             
-            # Add chunk information to metadata
-            for i, chunk in enumerate(chunks):
+            # Emit every complete chunk and carry the raw text from the last one on,
+            # split_text strips whitespace that must survive into the next window
+            for chunk in chunks[:-1]:
+                yield Document(page_content=chunk, metadata=dict(metadata))
+            buffer = buffer[self._last_chunk_start(buffer, chunks):]
+        
+        for chunk in splitter.split_text(buffer) if buffer else []:
+            yield Document(page_content=chunk, metadata=dict(metadata))
+    
+    def _last_chunk_start(self, text: str, chunks: List[str]) -> int:
+        """Locate the offset of the last chunk in the text it was split from"""
+        index = 0
+        previous_len = 0
+        
+        for chunk in chunks:
+            # Chunks overlap, so search from just before the end of the previous one
+            offset = max(0, index + previous_len - config.CHUNK_OVERLAP)
+            index = text.find(chunk, offset)
+            previous_len = len(chunk)
+        
+        return index
+    
+    def process_file_streams(self, files: Iterable[Tuple[Dict, Iterable[str]]]) -> Iterator[Document]:
+        """Lazily process streamed repository files with appropriate splitters"""
+        for metadata, content_stream in files:
+            # Chunks are yielded as they are split, so the total per file is not known
+            for i, chunk in enumerate(self.process_stream(content_stream, metadata)):
                 chunk.metadata.update({
                     'chunk_id': i,
-                    'total_chunks': len(chunks),
                     'chunk_size': len(chunk.page_content)
                 })
-            
-            processed_docs.extend(chunks)
-        
-        return processed_docs
\ No newline at end of file
+                yield chunk
\ No newline at end of file
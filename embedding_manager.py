@@ -1,3 +1,4 @@
+import threading
 import streamlit as st
 from typing import List
 from langchain.schema import Document
@@ -12,6 +13,9 @@ class EmbeddingManager:
         self.model_name = model_name
         self.embeddings = None
         self.vector_store = None
+        # Background indexing adds batches while queries search
+        self.lock = threading.Lock()
+        self.last_error = None
     
     def initialize_embeddings(self):
         """Initialize HuggingFace embeddings"""
@@ -39,9 +43,29 @@ class EmbeddingManager:
             st.error(f"Error creating vector store: {str(e)}")
             return False
     
+    def add_documents(self, documents: List[Document]) -> bool:
+        """Add a batch of documents, creating the vector store on the first batch"""
+        if not self.vector_store:
+            return self.create_vector_store(documents)
+        
+        try:
+            texts = [doc.page_content for doc in documents]
+            metadatas = [doc.metadata for doc in documents]
+            
+            # Embed outside the lock so queries are not blocked while a batch is encoded
+            embeddings = self.embeddings.embed_documents(texts)
+            with self.lock:
+                self.vector_store.add_embeddings(list(zip(texts, embeddings)), metadatas=metadatas)
+            return True
+        except Exception as e:
+            # May run on a background thread, so the caller reports the error
+            self.last_error = f"Error adding documents to vector store: {str(e)}"
+            return False
+    
     def similarity_search(self, query: str, k: int = config.TOP_K_RETRIEVAL) -> List[Document]:
         """Search for similar documents"""
         if not self.vector_store:
             return []
         
-        return self.vector_store.similarity_search(query, k=k)
\ No newline at end of file
+        with self.lock:
+            return self.vector_store.similarity_search(query, k=k)
\ No newline at end of file
@@ -1,11 +1,10 @@
 import os
 import requests
-import base64
-from typing import List, Dict, Optional
+import codecs
+from typing import List, Dict, Optional, Iterator, Iterable, Tuple
 import streamlit as st
 from langchain.text_splitter import Language
-from langchain.schema import Document
-from config import config
+from config import config, ENTRY_POINT_FILES
 
 class GitHubRepository:
     """Enhanced GitHub repository handler with better file processing"""
@@ -13,6 +12,10 @@ class GitHubRepository:
     def __init__(self, token: str = None):
         self.token = token if token else config.GITHUB_TOKEN
         self.headers = {'Authorization': f'token {self.token}'} if self.token else {}
+        self.repo_bytes_read = 0
+        self.skipped_directories = []
+        # Warnings are collected instead of shown, file streams may be read on a background thread
+        self.notices = []
         self.supported_extensions = {
             '.py': Language.PYTHON,
             '.js': Language.JS,
@@ -54,57 +57,182 @@ class GitHubRepository:
         
         return response.json()
     
-    def get_file_content(self, file_data: Dict) -> Optional[str]:
-        """Enhanced file content retrieval with better error handling"""
+    def stream_file_content(self, file_data: Dict, max_bytes: int = None,
+                            budget_name: str = "per-file byte budget") -> Iterator[str]:
+        """Stream raw file content and decode it incrementally"""
+        max_bytes = config.MAX_FILE_BYTES if max_bytes is None else max_bytes
+        headers = {**self.headers, 'Accept': 'application/vnd.github.raw'}
+        # Invalid bytes are replaced, chunks already yielded are indexed and cannot be taken back
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        bytes_read = 0
+        truncated = False
+        
         try:
-            if file_data.get('size', 0) > config.MAX_FILE_SIZE:
-                return None
-            
-            response = requests.get(file_data['url'], headers=self.headers)
-            if response.status_code != 200:
-                return None
-            
-            file_info = response.json()
-            content = base64.b64decode(file_info['content']).decode('utf-8')
-            return content
-            
+            with requests.get(file_data['url'], headers=headers, stream=True) as response:
+                if response.status_code != 200:
+                    return
+                
+                for raw in response.iter_content(chunk_size=config.STREAM_CHUNK_BYTES):
+                    # Only a file with bytes left over the budget counts as truncated
+                    if bytes_read + len(raw) > max_bytes:
+                        raw = raw[:max_bytes - bytes_read]
+                        truncated = True
+                    bytes_read += len(raw)
+                    self.repo_bytes_read += len(raw)
+                    
+                    text = decoder.decode(raw)
+                    if text:
+                        yield text
+                    
+                    if truncated:
+                        self.notices.append(f"{file_data.get('path', 'unknown file')} was cut off by the "
+                                            f"{budget_name}, only the first {bytes_read} bytes were indexed")
+                        break
+                
+                # A truncated read may stop inside a multi-byte character
+                text = decoder.decode(b'', final=not truncated)
+                if text:
+                    yield text
+                    
         except Exception as e:
-            st.warning(f"Could not read {file_data.get('path', 'unknown file')}: {str(e)}")
-            return None
+            self.notices.append(f"Could not read {file_data.get('path', 'unknown file')}: {str(e)}")
     
-    def crawl_repository(self, owner: str, repo: str, max_depth: int = 3) -> List[Document]:
-        """Enhanced repository crawler that returns LangChain Documents"""
-        documents = []
+    def list_repository_files(self, owner: str, repo: str, max_depth: Optional[int] = 3) -> Iterator[Dict]:
+        """Lazily list processable files, recording directories cut off by max_depth"""
+        self.skipped_directories = []
         
         def _crawl_recursive(path: str = "", current_depth: int = 0):
-            if current_depth > max_depth:
-                return
-            
             items = self.get_repo_structure(owner, repo, path)
             
             for item in items:
                 if item['type'] == 'file' and self._is_processable_file(item['name']):
-                    content = self.get_file_content(item)
-                    if content:
-                        # Create LangChain Document with metadata
-                        doc = Document(
-                            page_content=content,
-                            metadata={
-                                'source': item['path'],
-                                'file_name': item['name'],
-                                'file_type': self._get_file_type(item['name']),
-                                'url': item['html_url'],
-                                'size': item.get('size', 0),
-                                'repository': f"{owner}/{repo}"
-                            }
-                        )
-                        documents.append(doc)
-                        
+                    yield item
+                    
                 elif item['type'] == 'dir' and not self._should_skip_directory(item['name']):
-                    _crawl_recursive(item['path'], current_depth + 1)
+                    if max_depth is not None and current_depth + 1 > max_depth:
+                        self.skipped_directories.append(item['path'])
+                    else:
+                        yield from _crawl_recursive(item['path'], current_depth + 1)
+        
+        yield from _crawl_recursive()
+    
+    def get_repo_tree(self, owner: str, repo: str) -> List[Dict]:
+        """List every processable file with a single recursive tree request"""
+        branch = self.get_repo_info(owner, repo).get('default_branch')
+        if not branch:
+            return []
+        
+        url = f"https://api.github.com/repos/{owner}/{repo}/git/trees/{branch}?recursive=1"
+        response = requests.get(url, headers=self.headers)
+        
+        if response.status_code != 200:
+            return []
+        
+        tree = response.json()
+        if tree.get('truncated'):
+            self.notices.append("The repository tree is too large to list in one request, some files were not indexed")
+        
+        files = []
+        for entry in tree.get('tree', []):
+            parts = entry['path'].split('/')
+            if entry['type'] != 'blob' or not self._is_processable_file(parts[-1]):
+                continue
+            if any(self._should_skip_directory(part) for part in parts[:-1]):
+                continue
+            
+            # Same fields as a Contents API item, the blob url serves the raw content
+            files.append({
+                'type': 'file',
+                'name': parts[-1],
+                'path': entry['path'],
+                'size': entry.get('size', 0),
+                'url': entry['url'],
+                'html_url': f"https://github.com/{owner}/{repo}/blob/{branch}/{entry['path']}"
+            })
+        
+        return files
+    
+    def plan_repository_files(self, owner: str, repo: str, max_depth: int = 3) -> List[Dict]:
+        """List every processable file, most important first"""
+        files = self.get_repo_tree(owner, repo)
+        
+        # Fall back to the depth-limited Contents API crawl
+        if not files:
+            files = list(self.list_repository_files(owner, repo, max_depth))
+            if self.skipped_directories:
+                self.notices.append(f"{len(self.skipped_directories)} directories deeper than {max_depth} levels were not indexed")
+        
+        return sorted(files, key=self._file_priority)
+    
+    def iter_file_streams(self, owner: str, repo: str, files: Iterable[Dict]) -> Iterator[Tuple[Dict, Iterator[str]]]:
+        """Lazily yield file metadata with a content stream, within the repository byte budget"""
+        self.repo_bytes_read = 0
+        
+        for item in files:
+            if self.repo_bytes_read >= config.MAX_REPO_BYTES:
+                self.notices.append(f"Repository byte budget of {config.MAX_REPO_BYTES} bytes reached, remaining files were skipped")
+                return
+            
+            yield self._file_metadata(owner, repo, item), self._stream_within_repo_budget(item)
+    
+    def describe_files(self, owner: str, repo: str, files: Iterable[Dict]) -> List[Dict]:
+        """Document metadata for listed files without fetching their content"""
+        return [self._file_metadata(owner, repo, item) for item in files]
+    
+    def _file_metadata(self, owner: str, repo: str, item: Dict) -> Dict:
+        """Metadata attached to every chunk of a file"""
+        return {
+            'source': item['path'],
+            'file_name': item['name'],
+            'file_type': self._get_file_type(item['name']),
+            'url': item['html_url'],
+            'size': item.get('size', 0),
+            'repository': f"{owner}/{repo}"
+        }
+    
+    def _stream_within_repo_budget(self, file_data: Dict) -> Iterator[str]:
+        """Stream a file with the repository budget left when reading actually starts"""
+        repo_budget = config.MAX_REPO_BYTES - self.repo_bytes_read
+        if repo_budget <= 0:
+            return
+        
+        if repo_budget < config.MAX_FILE_BYTES:
+            yield from self.stream_file_content(file_data, repo_budget, "repository byte budget")
+        else:
+            yield from self.stream_file_content(file_data, config.MAX_FILE_BYTES)
+    
+    def iter_repository_files(self, owner: str, repo: str, max_depth: int = 3) -> Iterator[Tuple[Dict, Iterator[str]]]:
+        """Lazily yield repository files, most important first so the byte budget keeps them"""
+        files = sorted(self.list_repository_files(owner, repo, max_depth), key=self._file_priority)
+        
+        if self.skipped_directories:
+            self.notices.append(f"{len(self.skipped_directories)} directories deeper than {max_depth} levels were not indexed")
+        
+        yield from self.iter_file_streams(owner, repo, files)
+    
+    def _file_priority(self, item: Dict) -> Tuple[int, int, int]:
+        """Rank files by likely importance: READMEs, entry points, top-level and small core modules"""
+        name = item['name'].lower()
+        path = item['path'].lower()
+        depth = path.count('/')
+        size = item.get('size', 0)
+        
+        # Demote tests, examples and docs first so their READMEs and fixtures do not
+        # crowd out the project itself, and only trust shallow READMEs and entry points
+        if any(part in {'test', 'tests', 'example', 'examples', 'docs'} for part in path.split('/')[:-1]):
+            tier = 5
+        elif depth <= 1 and os.path.splitext(name)[0] == 'readme':
+            tier = 0
+        elif depth <= 1 and name in ENTRY_POINT_FILES:
+            tier = 1
+        elif depth <= 1:
+            tier = 2
+        elif size <= config.SMALL_FILE_BYTES:
+            tier = 3
+        else:
+            tier = 4
         
-        _crawl_recursive()
-        return documents
+        return tier, depth, size
     
     def _is_processable_file(self, filename: str) -> bool:
         """Enhanced file filtering"""
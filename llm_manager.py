@@ -5,6 +5,8 @@ from config import config
 class LLMManager:
     """Manages Groq LLM"""
     
+    error_prefixes = ("Groq client not initialized", "Error generating response:")
+    
     def __init__(self):
         self.groq_client = None
         self.model = config.GROQ_MODEL
@@ -33,4 +35,8 @@ class LLMManager:
             )
             return completion.choices[0].message.content
         except Exception as e:
-            return f"Error generating response: {str(e)}"
\ No newline at end of file
+            return f"Error generating response: {str(e)}"
+    
+    def is_error_response(self, response: str) -> bool:
+        """Check whether generate_response returned an error message"""
+        return response.startswith(self.error_prefixes)
\ No newline at end of file
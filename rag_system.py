@@ -1,9 +1,13 @@
-from typing import List, Dict, Any
+import threading
+import time
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Tuple, Optional
 from langchain.schema import Document
 from langchain.prompts import PromptTemplate
 from embedding_manager import EmbeddingManager
 from llm_manager import LLMManager
 from document_processor import AdvancedDocumentProcessor
+from repository_digest import RepositoryDigest
 from config import config
 
 class AdvancedRAGSystem:
@@ -13,6 +17,14 @@ class AdvancedRAGSystem:
         self.embedding_manager = EmbeddingManager()
         self.llm_manager = LLMManager()
         self.document_processor = AdvancedDocumentProcessor()
+        self.repository_digest = RepositoryDigest(self.llm_manager)
+        self.indexed_files = []
+        self.digest = {}
+        self.indexing_status = {}
+        self._digest_files = {}
+        self.digest_requested = False
+        self.stop_event = threading.Event()
+        self.indexing_thread = None
         
         # Custom prompt template
         self.prompt_template = PromptTemplate(
@@ -39,26 +51,197 @@ class AdvancedRAGSystem:
         """Setup Groq LLM"""
         return self.llm_manager.initialize_groq_llm(api_key)
     
-    def process_repository(self, documents: List[Document]) -> bool:
-        """Process repository documents and create vector store"""
-        # Process documents
-        processed_docs = self.document_processor.process_documents(documents)
+    def process_repository_files(self, files: Iterable[Tuple[Dict, Iterable[str]]], build_digest: bool = False,
+                                 total_files: Optional[int] = None, notices: Optional[List[str]] = None) -> bool:
+        """Process streamed repository files and create vector store"""
+        self._reset_status(total_files, notices, build_digest)
         
-        if not processed_docs:
-            return False
+        # Split each file as its content streams in
+        chunks = self.document_processor.process_file_streams(self._count_files(files))
+        
+        return self._index_documents(chunks, build_digest)
+    
+    def _reset_status(self, total_files: Optional[int], notices: Optional[List[str]] = None,
+                      build_digest: bool = False):
+        """Start a fresh indexing status, notices collects warnings from the file streams"""
+        self.indexed_files = []
+        self._digest_files = {}
+        self.digest = {}
+        self.digest_requested = build_digest
+        self.indexing_status = {
+            'total_files': total_files or 0,
+            'processed_files': 0,
+            'queryable': False,
+            'done': False,
+            'stopped_reason': None,
+            'messages': notices if notices is not None else []
+        }
+    
+    def _count_files(self, files: Iterable[Tuple[Dict, Iterable[str]]]) -> Iterator[Tuple[Dict, Iterable[str]]]:
+        """Count files as they are read so coverage includes files without content"""
+        for file in files:
+            self.indexing_status['processed_files'] += 1
+            yield file
+    
+    def _index_documents(self, chunks: Iterable[Document], build_digest: bool) -> bool:
+        """Create vector store and optionally the repository digest"""
+        success = self._add_chunks(chunks, build_digest) and bool(self.indexed_files)
+        
+        # Files skipped by depth or byte budgets stay in the total
+        status = self.indexing_status
+        status['total_files'] = max(status['total_files'], status['processed_files'])
+        status['queryable'] = success
+        status['done'] = True
         
-        # Create FAISS vector store
-        success = self.embedding_manager.create_vector_store(processed_docs)
+        # Build digest alongside the index
+        if success and build_digest:
+            self.digest = self.repository_digest.build(self._digest_files)
+            self._digest_files = {}
         
         return success
     
+    def _add_chunks(self, chunks: Iterable[Document], build_digest: bool) -> bool:
+        """Embed chunks into the vector store in bounded batches as they are produced"""
+        chunks = iter(chunks)
+        
+        for batch in iter(lambda: list(islice(chunks, config.EMBED_BATCH_SIZE)), []):
+            if not self.embedding_manager.add_documents(batch):
+                if self.embedding_manager.last_error:
+                    self.indexing_status['messages'].append(self.embedding_manager.last_error)
+                return False
+            
+            self.indexed_files = sorted(set(self.indexed_files) | {doc.metadata.get('source') for doc in batch})
+            if build_digest:
+                self.repository_digest.collect_files(batch, self._digest_files)
+        
+        return True
+    
+    def process_repository_progressive(self, files: Iterable[Tuple[Dict, Iterable[str]]], total_files: int,
+                                       build_digest: bool = False, time_budget: Optional[int] = None,
+                                       file_budget: Optional[int] = None, notices: Optional[List[str]] = None,
+                                       planned_files: Optional[List[Dict]] = None) -> bool:
+        """Index priority-ordered files in batches, queryable once the first batch lands"""
+        files = iter(files)
+        deadline = time.time() + time_budget if time_budget else None
+        self._reset_status(total_files, notices, build_digest)
+        
+        # Block until the first batch is in the vector store
+        while not self.indexed_files:
+            if not self._index_next_batch(files, file_budget, build_digest):
+                self.indexing_status['done'] = True
+                return False
+        
+        self.indexing_status['queryable'] = True
+        
+        # The planned files already give the local parts of the digest, summaries follow
+        if build_digest and planned_files:
+            self.digest = self.repository_digest.build_overview(
+                self.repository_digest.files_from_metadata(planned_files)
+            )
+        
+        # Keep indexing the remaining files in the background
+        self.indexing_thread = threading.Thread(
+            target=self._index_in_background,
+            args=(files, build_digest, deadline, file_budget),
+            daemon=True
+        )
+        self.indexing_thread.start()
+        
+        return True
+    
+    def stop_indexing(self):
+        """Stop background indexing, e.g. when another repository is processed"""
+        self.stop_event.set()
+    
+    def _index_next_batch(self, files: Iterator[Tuple[Dict, Iterable[str]]], file_budget: Optional[int],
+                          build_digest: bool) -> bool:
+        """Index the next batch of files, returns False when nothing is left to index"""
+        batch_size = config.INDEX_BATCH_SIZE
+        if file_budget:
+            batch_size = min(batch_size, file_budget - self.indexing_status['processed_files'])
+        
+        batch = list(islice(files, batch_size)) if batch_size > 0 else []
+        if not batch:
+            return False
+        
+        chunks = self.document_processor.process_file_streams(batch)
+        
+        if not self._add_chunks(chunks, build_digest):
+            self.indexing_status['stopped_reason'] = "vector store error"
+            return False
+        
+        self.indexing_status['processed_files'] += len(batch)
+        return True
+    
+    def _index_in_background(self, files: Iterator[Tuple[Dict, Iterable[str]]], build_digest: bool,
+                             deadline: Optional[float], file_budget: Optional[int]):
+        """Index remaining batches until the files or the budgets run out"""
+        try:
+            while True:
+                if self.stop_event.is_set():
+                    self.indexing_status['stopped_reason'] = "indexing stopped"
+                    return
+                if deadline and time.time() >= deadline:
+                    self.indexing_status['stopped_reason'] = "time budget reached"
+                    break
+                if not self._index_next_batch(files, file_budget, build_digest):
+                    if file_budget and self.indexing_status['processed_files'] >= file_budget:
+                        self.indexing_status['stopped_reason'] = "file budget reached"
+                    break
+            
+            # Add the summaries once every batch is in
+            if build_digest and self._digest_files:
+                overview = self.digest or self.repository_digest.build_overview(self._digest_files)
+                self.digest = {**overview, **self.repository_digest.summarize(self._digest_files)}
+                self._digest_files = {}
+                
+        except Exception as e:
+            self.indexing_status['stopped_reason'] = f"error: {str(e)}"
+        finally:
+            # Summaries will not arrive after a stop or an error
+            if self.digest.get('summaries_pending'):
+                self.digest = {**self.digest, 'summaries_pending': False}
+            self.indexing_status['done'] = True
+    
+    def get_coverage(self) -> Dict[str, Any]:
+        """Report how much of the repository the current answers cover"""
+        total_files = self.indexing_status.get('total_files', 0)
+        # Only files that produced chunks, unreadable or empty files are attempted but not covered
+        covered_files = len(self.indexed_files)
+        
+        return {
+            "covered_files": covered_files,
+            "attempted_files": self.indexing_status.get('processed_files', 0),
+            "total_files": total_files,
+            "percent": round(100 * covered_files / total_files, 1) if total_files else 0.0,
+            "done": self.indexing_status.get('done', False),
+            "stopped_reason": self.indexing_status.get('stopped_reason')
+        }
+    
     def query(self, question: str) -> Dict[str, Any]:
         """Query the RAG system"""
         try:
+            if self.digest:
+                sections = self.repository_digest.match_sections(question)
+                # Summary questions use retrieval until the LLM summaries are in
+                if sections and not ('summary' in sections and self.digest.get('summaries_pending')):
+                    return self.query_digest(sections)
             return self._query_with_groq(question)
         except Exception as e:
             return {"answer": f"Error processing query: {str(e)}", "sources": []}
     
+    def query_digest(self, sections: List[str]) -> Dict[str, Any]:
+        """Answer overview questions from the precomputed digest"""
+        answer = "\n\n".join(
+            self.repository_digest.format_section(self.digest, section)
+            for section in sections
+        )
+        
+        return {
+            "answer": answer,
+            "sources": []
+        }
+    
     def _query_with_groq(self, question: str) -> Dict[str, Any]:
         """Query using Groq with manual RAG pipeline"""
         # Get relevant documents
@@ -76,6 +259,10 @@ class AdvancedRAGSystem:
             for doc in relevant_docs
         ])
         
+        # Add the repository digest as background for the retrieved chunks
+        if self.digest:
+            context = f"Repository overview:\n{self.repository_digest.overview_context(self.digest)}\n\n{context}"
+        
         # Generate prompt
         prompt = self.prompt_template.format(context=context, question=question)
         
@@ -84,7 +271,8 @@ class AdvancedRAGSystem:
         
         return {
             "answer": answer,
-            "sources": relevant_docs
+            "sources": relevant_docs,
+            "coverage": self.get_coverage()
         }
     
     def get_repository_stats(self) -> Dict[str, Any]:
@@ -95,5 +283,6 @@ class AdvancedRAGSystem:
         return {
             "embedding_model": self.embedding_manager.model_name,
             "llm_model": self.llm_manager.model,
-            "vector_store": "FAISS"
+            "vector_store": "FAISS",
+            "digest": bool(self.digest)
         }
\ No newline at end of file
@@ -0,0 +1,285 @@
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Optional
+from langchain.schema import Document
+from langchain.prompts import PromptTemplate
+from llm_manager import LLMManager
+from config import config, ENTRY_POINT_FILES
+
+class RepositoryDigest:
+    """Builds a precomputed repository digest at index time"""
+    
+    def __init__(self, llm_manager: LLMManager):
+        self.llm_manager = llm_manager
+        self.languages = {
+            '.py': 'Python', '.js': 'JavaScript', '.jsx': 'JavaScript',
+            '.ts': 'TypeScript', '.tsx': 'TypeScript', '.java': 'Java',
+            '.cpp': 'C++', '.c': 'C', '.cs': 'C#', '.php': 'PHP',
+            '.rb': 'Ruby', '.go': 'Go', '.rs': 'Rust', '.scala': 'Scala',
+            '.kt': 'Kotlin', '.sol': 'Solidity', '.r': 'R',
+            '.md': 'Markdown', '.rst': 'reStructuredText', '.html': 'HTML',
+            '.css': 'CSS', '.scss': 'SCSS', '.less': 'Less',
+            '.json': 'JSON', '.yaml': 'YAML', '.yml': 'YAML', '.toml': 'TOML'
+        }
+        
+        # Overview questions answered straight from the digest
+        self.sections = {
+            'languages': "What programming languages are primarily used in this repository?",
+            'structure': "What is the overall project structure and organization?",
+            'entry_points': "What are the main entry points or important files?",
+            'summary': "What does this repository do?"
+        }
+        # Only questions about the repository as a whole, so "language model" or
+        # "page layout" questions still go through retrieval
+        repo = r"(?:repo|repository|project|codebase)"
+        self.section_patterns = {
+            'languages': [
+                rf"\blanguages? (?:is|are|does|do) (?:this|the) {repo}\b",
+                rf"\blanguages? (?:is|are) (?:primarily |mainly )?used in (?:this|the) {repo}\b",
+                rf"\b(?:this|the) {repo}(?:'s)? (?:programming )?languages?\b",
+                rf"\b{repo} (?:is )?written in\b",
+                r"\btech stack\b"
+            ],
+            'structure': [
+                rf"\b(?:structure|organi[sz]ation|layout) of (?:this|the) {repo}\b",
+                rf"\b{repo}(?:'s)? (?:structure|organi[sz]ation|layout)\b",
+                rf"\bhow is (?:this|the) {repo} (?:organi[sz]ed|structured|laid out)\b"
+            ],
+            'entry_points': [
+                rf"\bentry ?points? (?:of|in|for) (?:this|the) {repo}\b",
+                rf"\b(?:this|the) {repo}(?:'s)? entry ?points?\b",
+                r"^what are the main entry ?points\b",
+                rf"\b(?:main|important) files (?:of|in) (?:this|the) {repo}\b"
+            ],
+            'summary': [
+                rf"^what (?:does|is) (?:this|the) {repo}(?: do| about| for)?\??$",
+                rf"\b(?:overview|purpose|summary) of (?:this|the) {repo}\b",
+                rf"\bsummari[sz]e (?:this|the) {repo}\b"
+            ]
+        }
+        
+        self.map_template = PromptTemplate(
+            input_variables=["directory", "files"],
+            template="""You are an expert software engineer. Summarize the purpose of the directory `{directory}` of a GitHub repository based on the file excerpts below.
+
+            File excerpts:
+            {files}
+
+            Instructions:
+            - Answer in 2-4 sentences
+            - Mention the main responsibilities and notable files
+
+            Summary:"""
+        )
+        self.reduce_template = PromptTemplate(
+            input_variables=["summaries"],
+            template="""You are an expert software engineer. Based on the directory summaries below, describe what this GitHub repository does and how it is organized.
+
+            Directory summaries:
+            {summaries}
+
+            Instructions:
+            - Start with a one-paragraph overview of the project
+            - Then describe the main components and how they fit together
+
+            Overview:"""
+        )
+    
+    def build(self, files: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the digest from files gathered with collect_files"""
+        if not files:
+            return {}
+        
+        return {**self.build_overview(files), **self.summarize(files)}
+    
+    def build_overview(self, files: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the parts of the digest computed locally, summaries follow from summarize"""
+        return {
+            'file_count': len(files),
+            'languages': self._language_breakdown(files),
+            'file_types': self._file_type_breakdown(files),
+            'directory_tree': self._directory_tree(files),
+            'entry_points': self._entry_points(files),
+            'directory_summaries': {},
+            'summary': None,
+            'summaries_pending': True
+        }
+    
+    def summarize(self, files: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Map-reduce LLM summaries over the excerpts gathered with collect_files"""
+        directory_summaries = self._summarize_directories(files)
+        
+        return {
+            'directory_summaries': directory_summaries,
+            'summary': self._reduce_summaries(directory_summaries),
+            'summaries_pending': False
+        }
+    
+    def files_from_metadata(self, metadatas: Iterable[Dict]) -> Dict[str, Dict[str, Any]]:
+        """Per-file stats from document metadata, for files whose content is not read yet"""
+        return {
+            metadata['source']: {
+                'file_type': metadata.get('file_type', 'text'),
+                'size': metadata.get('size', 0),
+                'excerpt': ''
+            }
+            for metadata in metadatas
+        }
+    
+    def match_sections(self, question: str) -> List[str]:
+        """Return the digest sections an overview question asks about"""
+        question = question.lower().strip()
+        return [
+            section for section, patterns in self.section_patterns.items()
+            if any(re.search(pattern, question) for pattern in patterns)
+        ]
+    
+    def overview_context(self, digest: Dict[str, Any]) -> str:
+        """Short repository overview passed to the LLM alongside retrieved chunks"""
+        languages = ", ".join(list(digest['languages'])[:5])
+        entry_points = ", ".join(digest['entry_points'][:10]) or "none found"
+        overview = f"Languages: {languages}\nLikely entry points: {entry_points}"
+        
+        if digest.get('summary'):
+            overview += f"\nSummary: {digest['summary']}"
+        return overview
+    
+    def format_section(self, digest: Dict[str, Any], section: str) -> str:
+        """Render one digest section as markdown"""
+        if section == 'languages':
+            lines = [
+                f"- **{language}**: {stats['files']} files, {stats['bytes']:,} bytes"
+                for language, stats in digest['languages'].items()
+            ]
+            lines.append("\n**File types:** " + ", ".join(
+                f"{file_type} ({count})" for file_type, count in digest['file_types'].items()
+            ))
+            return "\n".join(lines)
+        
+        if section == 'structure':
+            summaries = "\n".join(
+                f"- **{directory}**: {summary}"
+                for directory, summary in digest['directory_summaries'].items()
+            )
+            if digest.get('summaries_pending'):
+                summaries = "_Directory summaries are still being generated._"
+            return f"```\n{digest['directory_tree']}\n```\n\n{summaries}"
+        
+        if section == 'entry_points':
+            if not digest['entry_points']:
+                return "No conventional entry points were found among the indexed files."
+            return "\n".join(f"- `{path}`" for path in digest['entry_points'])
+        
+        if digest.get('summaries_pending'):
+            return "The repository summary is still being generated while indexing continues."
+        return digest.get('summary') or "No repository summary is available."
+    
+    def collect_files(self, documents: Iterable[Document], files: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Fold a batch of chunks into per-file stats and excerpts keyed by path"""
+        for doc in documents:
+            source = doc.metadata.get('source')
+            if not source:
+                continue
+            
+            file_info = files.setdefault(source, {
+                'file_type': doc.metadata.get('file_type', 'text'),
+                'size': doc.metadata.get('size', 0),
+                'excerpt': ''
+            })
+            if len(file_info['excerpt']) < config.DIGEST_EXCERPT_CHARS:
+                remaining = config.DIGEST_EXCERPT_CHARS - len(file_info['excerpt'])
+                file_info['excerpt'] += doc.page_content[:remaining]
+        
+        return files
+    
+    def _language_breakdown(self, files: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+        """Count files and bytes per language"""
+        breakdown = defaultdict(lambda: {'files': 0, 'bytes': 0})
+        
+        for path, file_info in files.items():
+            ext = os.path.splitext(path)[1].lower()
+            language = self.languages.get(ext, 'Other')
+            breakdown[language]['files'] += 1
+            breakdown[language]['bytes'] += file_info['size']
+        
+        return dict(sorted(breakdown.items(), key=lambda item: item[1]['bytes'], reverse=True))
+    
+    def _file_type_breakdown(self, files: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+        """Count files per processing file type"""
+        breakdown = defaultdict(int)
+        
+        for file_info in files.values():
+            breakdown[file_info['file_type']] += 1
+        
+        return dict(sorted(breakdown.items(), key=lambda item: item[1], reverse=True))
+    
+    def _directory_tree(self, files: Dict[str, Dict[str, Any]]) -> str:
+        """Render the indexed files as an indented directory tree"""
+        lines = []
+        seen_dirs = set()
+        
+        for path in sorted(files):
+            parts = path.split('/')
+            for depth, part in enumerate(parts[:-1]):
+                directory = '/'.join(parts[:depth + 1])
+                if directory not in seen_dirs:
+                    seen_dirs.add(directory)
+                    lines.append(f"{'    ' * depth}{part}/")
+            lines.append(f"{'    ' * (len(parts) - 1)}{parts[-1]}")
+        
+        return '\n'.join(lines)
+    
+    def _entry_points(self, files: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Find likely entry points, shallowest paths first"""
+        entry_points = [
+            path for path in files
+            if os.path.basename(path).lower() in ENTRY_POINT_FILES
+        ]
+        return sorted(entry_points, key=lambda path: (path.count('/'), path))
+    
+    def _summarize_directories(self, files: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+        """Map step: summarize the largest directories concurrently"""
+        directories = defaultdict(list)
+        for path in sorted(files):
+            directories[os.path.dirname(path) or '.'].append(path)
+        
+        largest = sorted(
+            directories,
+            key=lambda d: sum(files[path]['size'] for path in directories[d]),
+            reverse=True
+        )[:config.DIGEST_MAX_DIRECTORIES]
+        
+        prompts = {}
+        for directory in largest:
+            excerpts = ""
+            for path in directories[directory]:
+                excerpts += f"File: {path}\n{files[path]['excerpt']}\n\n"
+                if len(excerpts) >= config.DIGEST_MAX_CHARS_PER_DIRECTORY:
+                    break
+            prompts[directory] = self.map_template.format(
+                directory=directory,
+                files=excerpts[:config.DIGEST_MAX_CHARS_PER_DIRECTORY]
+            )
+        
+        with ThreadPoolExecutor(max_workers=config.DIGEST_MAX_WORKERS) as executor:
+            summaries = executor.map(self.llm_manager.generate_response, prompts.values())
+            
+            # Failed requests (e.g. rate limits) are left out rather than shown as summaries
+            return dict(sorted(
+                (directory, summary) for directory, summary in zip(prompts.keys(), summaries)
+                if not self.llm_manager.is_error_response(summary)
+            ))
+    
+    def _reduce_summaries(self, directory_summaries: Dict[str, str]) -> Optional[str]:
+        """Reduce step: combine directory summaries into a repository overview"""
+        if not directory_summaries:
+            return None
+        
+        summaries = "\n\n".join(
+            f"Directory: {directory}\n{summary}"
+            for directory, summary in directory_summaries.items()
+        )
+        summary = self.llm_manager.generate_response(self.reduce_template.format(summaries=summaries))
+        return None if self.llm_manager.is_error_response(summary) else summary
\ No newline at end of file
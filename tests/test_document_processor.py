@@ -0,0 +1,54 @@
+import random
+from config import config
+from document_processor import AdvancedDocumentProcessor
+
+
+def _pieces(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _sample_text(lines=2000):
+    rng = random.Random(0)
+    words = ["alpha", "beta", "gamma", "delta", "epsilon", "zeta", "eta", "theta"]
+    return "\n".join(
+        " ".join(rng.choice(words) for _ in range(rng.randint(1, 12)))
+        for _ in range(lines)
+    ) + "\n"
+
+
+def test_process_stream_matches_split_text_across_windows(monkeypatch):
+    monkeypatch.setattr(config, "STREAM_WINDOW_CHARS", 3000)
+    processor = AdvancedDocumentProcessor()
+    text = _sample_text()
+    expected = processor.splitters['default'].split_text(text)
+
+    for size in (1, 37, 500, 4096):
+        chunks = processor.process_stream(_pieces(text, size), {'file_type': 'text'})
+        assert [chunk.page_content for chunk in chunks] == expected
+
+
+def test_process_stream_keeps_whitespace_at_window_boundary(monkeypatch):
+    monkeypatch.setattr(config, "STREAM_WINDOW_CHARS", 10)
+    processor = AdvancedDocumentProcessor()
+    pieces = ["foo bar baz\n" * 200, "qux"]
+
+    chunks = list(processor.process_stream(pieces, {'file_type': 'text'}))
+
+    assert not any("bazqux" in chunk.page_content or "bazfoo" in chunk.page_content for chunk in chunks)
+    assert chunks[-1].page_content.endswith("baz\nqux")
+
+
+def test_process_file_streams_numbers_chunks_per_file(monkeypatch):
+    monkeypatch.setattr(config, "STREAM_WINDOW_CHARS", 3000)
+    processor = AdvancedDocumentProcessor()
+    text = _sample_text(500)
+    files = [
+        ({'source': 'a.txt', 'file_type': 'text'}, iter(_pieces(text, 100))),
+        ({'source': 'b.txt', 'file_type': 'text'}, iter(_pieces(text, 100)))
+    ]
+
+    chunks = list(processor.process_file_streams(files))
+
+    for source in ('a.txt', 'b.txt'):
+        ids = [chunk.metadata['chunk_id'] for chunk in chunks if chunk.metadata['source'] == source]
+        assert ids == list(range(len(ids)))
@@ -0,0 +1,137 @@
+import github_repository
+from config import config
+from github_repository import GitHubRepository
+
+
+class FakeResponse:
+    def __init__(self, chunks, status_code=200):
+        self.chunks = chunks
+        self.status_code = status_code
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def iter_content(self, chunk_size):
+        return iter(self.chunks)
+
+
+def _client(monkeypatch, files):
+    monkeypatch.setattr(github_repository.requests, "get",
+                        lambda url, headers=None, stream=False: FakeResponse(files[url]))
+    return GitHubRepository(token="")
+
+
+def _item(path):
+    return {'type': 'file', 'name': path.split('/')[-1], 'path': path, 'size': 0,
+            'url': path, 'html_url': f"https://github.com/o/r/blob/main/{path}"}
+
+
+def test_stream_file_content_truncates_at_max_bytes(monkeypatch):
+    client = _client(monkeypatch, {'a.py': [b"abcd", b"efgh", b"ijkl"]})
+
+    text = ''.join(client.stream_file_content(_item('a.py'), max_bytes=6))
+
+    assert text == "abcdef"
+    assert client.notices == ["a.py was cut off by the per-file byte budget, only the first 6 bytes were indexed"]
+
+
+def test_stream_file_content_keeps_file_of_exactly_budget_size(monkeypatch):
+    client = _client(monkeypatch, {'a.py': [b"abcd", b"ef"]})
+
+    text = ''.join(client.stream_file_content(_item('a.py'), max_bytes=6))
+
+    assert text == "abcdef"
+    assert client.notices == []
+
+
+def test_stream_file_content_decodes_character_split_across_chunks(monkeypatch):
+    encoded = "héllo wörld".encode('utf-8')
+    client = _client(monkeypatch, {'a.md': [encoded[:2], encoded[2:9], encoded[9:]]})
+
+    assert ''.join(client.stream_file_content(_item('a.md'))) == "héllo wörld"
+
+
+def test_stream_file_content_replaces_invalid_bytes(monkeypatch):
+    client = _client(monkeypatch, {'a.txt': [b"ok \xff", b" still ok"]})
+
+    assert ''.join(client.stream_file_content(_item('a.txt'))) == "ok � still ok"
+    assert client.notices == []
+
+
+def test_iter_file_streams_stops_at_repository_budget(monkeypatch):
+    monkeypatch.setattr(config, "MAX_REPO_BYTES", 10)
+    client = _client(monkeypatch, {'a.py': [b"123456"], 'b.py': [b"123456"], 'c.py': [b"123456"]})
+
+    streamed = {
+        metadata['source']: ''.join(content_stream)
+        for metadata, content_stream in client.iter_file_streams('o', 'r', [_item(p) for p in ('a.py', 'b.py', 'c.py')])
+    }
+
+    assert streamed == {'a.py': "123456", 'b.py': "1234"}
+    assert client.notices == [
+        "b.py was cut off by the repository byte budget, only the first 4 bytes were indexed",
+        "Repository byte budget of 10 bytes reached, remaining files were skipped"
+    ]
+
+
+class FakeJSONResponse:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def json(self):
+        return self.data
+
+
+def _tree_client(monkeypatch, tree):
+    def fake_get(url, headers=None):
+        if url.endswith("/repos/o/r"):
+            return FakeJSONResponse({'default_branch': 'main'})
+        return FakeJSONResponse(tree)
+
+    monkeypatch.setattr(github_repository.requests, "get", fake_get)
+    return GitHubRepository(token="")
+
+
+def test_file_priority_demotes_tests_examples_and_deep_entry_points():
+    client = GitHubRepository(token="")
+    paths = ['src/pkg/core.py', 'a/b/c/package.json', 'tests/fixtures/app/index.js', 'docs/guide/README.md',
+             'examples/b/README.md', 'setup.py', 'pkg/__init__.py', 'main.py', 'examples/a/README.md', 'README.md']
+    items = [{'name': path.split('/')[-1], 'path': path, 'size': 100} for path in paths]
+
+    ranked = [item['path'] for item in sorted(items, key=client._file_priority)]
+
+    assert ranked[0] == 'README.md'
+    assert set(ranked[1:3]) == {'main.py', 'setup.py'}
+    assert ranked[3:6] == ['pkg/__init__.py', 'src/pkg/core.py', 'a/b/c/package.json']
+    assert set(ranked[-4:]) == {'examples/a/README.md', 'examples/b/README.md',
+                                'docs/guide/README.md', 'tests/fixtures/app/index.js'}
+
+
+def test_get_repo_tree_skips_directories_and_unprocessable_blobs(monkeypatch):
+    client = _tree_client(monkeypatch, {'truncated': False, 'tree': [
+        {'path': 'src', 'type': 'tree', 'url': 't1'},
+        {'path': 'src/deep/a/b/c/core.py', 'type': 'blob', 'size': 100, 'url': 'b1'},
+        {'path': 'node_modules/lib/index.js', 'type': 'blob', 'size': 1, 'url': 'b2'},
+        {'path': 'logo.png', 'type': 'blob', 'size': 50, 'url': 'b3'},
+        {'path': 'README.md', 'type': 'blob', 'size': 5, 'url': 'b4'}
+    ]})
+
+    files = client.get_repo_tree('o', 'r')
+
+    assert [item['path'] for item in files] == ['src/deep/a/b/c/core.py', 'README.md']
+    assert files[1] == {'type': 'file', 'name': 'README.md', 'path': 'README.md', 'size': 5, 'url': 'b4',
+                        'html_url': "https://github.com/o/r/blob/main/README.md"}
+    assert client.notices == []
+
+
+def test_get_repo_tree_reports_truncated_listing(monkeypatch):
+    client = _tree_client(monkeypatch, {'truncated': True, 'tree': [
+        {'path': 'app.py', 'type': 'blob', 'size': 5, 'url': 'b1'}
+    ]})
+
+    assert [item['path'] for item in client.get_repo_tree('o', 'r')] == ['app.py']
+    assert client.notices == ["The repository tree is too large to list in one request, some files were not indexed"]
@@ -0,0 +1,96 @@
+import threading
+from config import config
+from rag_system import AdvancedRAGSystem
+
+
+class StubEmbeddingManager:
+    """Records added chunks, blocking every batch after the first until released"""
+
+    def __init__(self):
+        self.documents = []
+        self.last_error = None
+        self.release = threading.Event()
+        self.release.set()
+        self.waiting = threading.Event()
+
+    def add_documents(self, documents):
+        if self.documents:
+            self.waiting.set()
+            self.release.wait(timeout=5)
+        self.documents.extend(documents)
+        return True
+
+
+def _rag_system():
+    rag_system = AdvancedRAGSystem()
+    rag_system.embedding_manager = StubEmbeddingManager()
+    rag_system.llm_manager.generate_response = lambda prompt: "A summary"
+    return rag_system
+
+
+def _files(count):
+    return [
+        ({'source': f"m{i}.py", 'file_type': 'python', 'size': 10}, iter([f"x = {i}\n"]))
+        for i in range(count)
+    ]
+
+
+def test_progressive_indexing_is_queryable_after_first_batch(monkeypatch):
+    monkeypatch.setattr(config, "INDEX_BATCH_SIZE", 2)
+    rag_system = _rag_system()
+    rag_system.embedding_manager.release.clear()
+
+    assert rag_system.process_repository_progressive(_files(6), total_files=6)
+
+    assert rag_system.indexing_status['queryable']
+    assert rag_system.get_coverage()['covered_files'] == 2
+
+    rag_system.embedding_manager.release.set()
+    rag_system.indexing_thread.join(timeout=5)
+    coverage = rag_system.get_coverage()
+    assert coverage['done'] and coverage['covered_files'] == 6 and coverage['percent'] == 100.0
+
+
+def test_progressive_indexing_respects_file_budget(monkeypatch):
+    monkeypatch.setattr(config, "INDEX_BATCH_SIZE", 2)
+    rag_system = _rag_system()
+
+    rag_system.process_repository_progressive(_files(10), total_files=10, file_budget=5)
+    rag_system.indexing_thread.join(timeout=5)
+
+    assert rag_system.indexed_files == ['m0.py', 'm1.py', 'm2.py', 'm3.py', 'm4.py']
+    assert rag_system.indexing_status['stopped_reason'] == "file budget reached"
+
+
+def test_stop_indexing_halts_background_thread(monkeypatch):
+    monkeypatch.setattr(config, "INDEX_BATCH_SIZE", 2)
+    rag_system = _rag_system()
+    rag_system.embedding_manager.release.clear()
+
+    rag_system.process_repository_progressive(_files(10), total_files=10)
+    assert rag_system.embedding_manager.waiting.wait(timeout=5)
+    rag_system.stop_indexing()
+    rag_system.embedding_manager.release.set()
+    rag_system.indexing_thread.join(timeout=5)
+
+    coverage = rag_system.get_coverage()
+    assert coverage['done'] and coverage['stopped_reason'] == "indexing stopped"
+    assert coverage['covered_files'] == 4
+
+
+def test_progressive_digest_overview_is_available_before_summaries(monkeypatch):
+    monkeypatch.setattr(config, "INDEX_BATCH_SIZE", 2)
+    rag_system = _rag_system()
+    rag_system.embedding_manager.release.clear()
+    files = _files(4)
+
+    rag_system.process_repository_progressive(files, total_files=4, build_digest=True,
+                                              planned_files=[metadata for metadata, _ in files])
+
+    assert rag_system.digest['file_count'] == 4
+    assert rag_system.digest['summaries_pending']
+
+    rag_system.embedding_manager.release.set()
+    rag_system.indexing_thread.join(timeout=5)
+    assert not rag_system.digest['summaries_pending']
+    assert rag_system.digest['summary'] == "A summary"
@@ -0,0 +1,35 @@
+from langchain.schema import Document
+from llm_manager import LLMManager
+from repository_digest import RepositoryDigest
+
+
+def test_match_sections_only_answers_repository_overview_questions():
+    digest = RepositoryDigest(LLMManager())
+
+    assert digest.match_sections("What programming languages are primarily used in this repository?") == ['languages']
+    assert digest.match_sections("What is the overall project structure and organization?") == ['structure']
+    assert digest.match_sections("What does this repository do?") == ['summary']
+
+    for question in ("Which language model does this use?",
+                     "What data structure backs the cache?",
+                     "How is the page layout rendered?",
+                     "What does this project use for caching?"):
+        assert digest.match_sections(question) == []
+
+
+def test_build_leaves_out_failed_directory_summaries():
+    llm_manager = LLMManager()
+    llm_manager.generate_response = (
+        lambda prompt: "Error generating response: rate limit" if "`pkg`" in prompt else "A summary"
+    )
+    digest = RepositoryDigest(llm_manager)
+    files = digest.collect_files([
+        Document(page_content="print(1)", metadata={'source': 'main.py', 'file_type': 'python', 'size': 8}),
+        Document(page_content="x = 1", metadata={'source': 'pkg/core.py', 'file_type': 'python', 'size': 5})
+    ], {})
+
+    result = digest.build(files)
+
+    assert result['directory_summaries'] == {'.': "A summary"}
+    assert result['summary'] == "A summary"
+    assert result['entry_points'] == ['main.py']